@@ -1,12 +1,26 @@
 import re
 from abc import ABC, abstractmethod
+import atexit
 import logging
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from dataclasses import dataclass
+
+# Diagnostic messages from the payment path; DEBUG is off by default, so these cost nothing unless enabled.
+_logger = logging.getLogger(__name__)
+
+# Precompiled validation pattern
+# Compiled once at import time so validate() does not go through the re module cache on every call.
+# Fixed-shape digit fields (card number, expiry date, CVV) are checked with plain string methods instead.
+_EMAIL_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
 
 # Abstract base class for discounts 
 # This class defines an interface for discount strategies.
+# Discount strategies hold no per-order state, so each payment method shares a single class-level instance.
 # Follows the Open/Closed Principle (OCP) because new discount types can be added without modifying existing code & Follows the (SRP) because So that each function is responsible for only one thing.
 class Discount(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def calculate_discount(self, amount: float) -> float:
         pass
@@ -14,28 +28,46 @@ class Discount(ABC):
 # Concrete class for percentage discount
 # Implements the strategy for percentage-based discounts.
 class PercentageDiscount(Discount):
+    __slots__ = ('percentage', '_rate')
+
     def __init__(self, percentage: float):
         self.percentage = percentage
+        self._rate = percentage / 100  # Computed once instead of on every calculate_discount call
 
     def calculate_discount(self, amount: float) -> float:
-        return amount * (self.percentage / 100)
+        return amount * self._rate
 
 # Concrete class for fixed amount discount
 # Implements the strategy for fixed amount discounts.
 class FixedAmountDiscount(Discount):
+    __slots__ = ('discount_amount',)
+
     def __init__(self, discount_amount: float):
         self.discount_amount = discount_amount
 
     def calculate_discount(self, amount: float) -> float:
         return self.discount_amount
     
+# Result of validating payment details, also returned by Order.pay for processing failures
+# Carries the reason for a rejection so the caller decides whether and how to show it.
+# Truthiness follows ok, so callers that treated the old bool return value as a condition keep working.
+@dataclass(slots=True)
+class ValidationResult:
+    ok: bool
+    reason: str = ''
+
+    def __bool__(self):
+        return self.ok
+
 # Abstract base class for payment methods
 # Defines an interface for different payment methods.
 # The Strategy Pattern is used here as different payment methods implement the strategy defined by this class.
 # Follows the Open/Closed Principle (OCP) because new Payment types can be added without modifying existing code & Follows the (SRP) because So that each function is responsible for only one thing & Dependency Inversion Principle.
 class PaymentMethod(ABC):
+    __slots__ = ()
+
     @abstractmethod
-    def validate(self, payment_details: dict) -> bool:
+    def validate(self, payment_details: dict) -> ValidationResult:
         pass
 
     @abstractmethod
@@ -50,78 +82,100 @@ class PaymentMethod(ABC):
     def get_discount(self) -> Discount:
         return None
 
+# Mock account balances
+# Shared by all payment method instances, so creating a payment method does not rebuild these tables.
+_BALANCES: dict[str, dict[str | int, float]] = {
+    "card": {
+        1234567891234567: 500.0,  # Card numbers are stored as ints, see CreditCardPayment.validate
+    },
+    "paypal": {
+        "Rand@gmail.com": 500.0,
+        "Sama@gmail.com": 1000.0,
+    },
+    "crypto": {
+        "1BoatSLRHtKNngkdXEeobR76b53LETtpyT": 1000.0,
+    },
+}
+
 # Concrete class for credit card payment
 # Implements the strategy for credit card payments.
 class CreditCardPayment(PaymentMethod):
-    def __init__(self):
-        self.approved_cards = {
-            "1234567891234567": 500.0,  # Mock balance
-        }
+    __slots__ = ()
+    NAME = 'CreditCard'  # Name used in transaction logs
+    _DISCOUNT = FixedAmountDiscount(30)  # Fixed discount of $30
+    approved_cards = _BALANCES["card"]
+
+    @staticmethod
+    def _is_card_number(card_number) -> bool:
+        return bool(card_number and len(card_number) == 16 and card_number.isascii() and card_number.isdecimal())
+
+    # The card number in payment_details is always the source of truth for the int key.
+    def _card_id(self, payment_details: dict):
+        card_number = payment_details.get("card_number")
+        if self._is_card_number(card_number):
+            return int(card_number)
+        return None
 
-    def validate(self, payment_details: dict) -> bool:
+    def validate(self, payment_details: dict) -> ValidationResult:
         card_number = payment_details.get("card_number")
         expiry_date = payment_details.get("expiry_date")
         cvv = payment_details.get("cvv")
 
-        if not card_number or not re.match(r"^\d{16}$", card_number):
-            print("Invalid Credit Card number")
-            return False
-        if not expiry_date or not re.match(r"^\d{2}/\d{2}$", expiry_date):
-            print("Invalid expiry date")
-            return False
-        if not cvv or not re.match(r"^\d{3}$", cvv):
-            print("Invalid CVV")
-            return False
+        if not self._is_card_number(card_number):
+            return ValidationResult(False, "Invalid Credit Card number")
+        if not (expiry_date and len(expiry_date) == 5 and expiry_date[2] == '/'
+                and expiry_date[:2].isdecimal() and expiry_date[3:].isdecimal()):
+            return ValidationResult(False, "Invalid expiry date")
+        if not (cvv and len(cvv) == 3 and cvv.isdecimal()):
+            return ValidationResult(False, "Invalid CVV")
 
-        if card_number not in self.approved_cards:
-            print("Card number not approved")
-            return False
+        if int(card_number) not in self.approved_cards:
+            return ValidationResult(False, "Card number not approved")
 
-        print("Credit Card details are valid.")
-        return True
+        _logger.debug("Credit Card details are valid.")
+        return ValidationResult(True)
 
     def check_balance(self, payment_details: dict, amount: float) -> bool:
-        card_number = payment_details.get("card_number")
-        if card_number in self.approved_cards:
-            return self.approved_cards[card_number] >= amount
+        card_id = self._card_id(payment_details)
+        if card_id in self.approved_cards:
+            return self.approved_cards[card_id] >= amount
         return False
 
     def process_payment(self, amount: float, payment_details: dict = None) -> bool:
         card_number = payment_details.get("card_number")
 
         if not self.check_balance(payment_details, amount):
-            print(f"Not enough money for {card_number}")
+            _logger.debug("Not enough money for %s", card_number)
             return False
 
-        self.approved_cards[card_number] -= amount
-        print(f"Processing Credit Card payment of ${amount:.2f}")
+        self.approved_cards[self._card_id(payment_details)] -= amount
+        _logger.debug("Processing Credit Card payment of $%.2f", amount)
         return True
 
     def get_discount(self) -> Discount:
-        return FixedAmountDiscount(30)  # Fixed discount of $30
+        return self._DISCOUNT
 
 # Concrete class for PayPal payment
 # Implements the strategy for PayPal payments.
 class PayPalPayment(PaymentMethod):
-    def __init__(self):
-        self.approved_emails = {
-            "Rand@gmail.com": 500.0,
-            "Sama@gmail.com": 1000.0,
-        }
+    __slots__ = ()
+    NAME = 'PayPal'  # Name used in transaction logs
+    _DISCOUNT = PercentageDiscount(10)  # 10% discount for PayPal
+    approved_emails = _BALANCES["paypal"]
 
-    def validate(self, payment_details: dict) -> bool:
+    def validate(self, payment_details: dict) -> ValidationResult:
         email = payment_details.get("email")
 
-        if not email or not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-            print("Invalid PayPal email")
-            return False
+        # Cheap length and '@'/'.' checks reject malformed input before the regex runs.
+        if (not email or len(email) > 254 or email.count('@') != 1
+                or '.' not in email.rsplit('@', 1)[1] or not _EMAIL_RE.match(email)):
+            return ValidationResult(False, "Invalid PayPal email")
 
         if email not in self.approved_emails:
-            print("Email not approved for PayPal")
-            return False
+            return ValidationResult(False, "Email not approved for PayPal")
 
-        print("PayPal details are valid.")
-        return True
+        _logger.debug("PayPal details are valid.")
+        return ValidationResult(True)
 
     def check_balance(self, payment_details: dict, amount: float) -> bool:
         email = payment_details.get("email")
@@ -131,38 +185,34 @@ class PayPalPayment(PaymentMethod):
         email = payment_details.get("email")
 
         if not self.check_balance(payment_details, amount):
-            print(f"Not enough money for {email}")
+            _logger.debug("Not enough money for %s", email)
             return False
 
         self.approved_emails[email] -= amount
-        print(f"Processing PayPal payment of ${amount:.2f}...")
-        print(f"PayPal payment of ${amount:.2f} was successful.")
+        _logger.debug("Processing PayPal payment of $%.2f...", amount)
+        _logger.debug("PayPal payment of $%.2f was successful.", amount)
         return True
 
     def get_discount(self) -> Discount:
-        return PercentageDiscount(10)  # 10% discount for PayPal
+        return self._DISCOUNT
 
 # Concrete class for cryptocurrency payment
 # Implements the strategy for cryptocurrency payments.
 class CryptocurrencyPayment(PaymentMethod):
-    def __init__(self):
-        self.mock_wallets = {
-            "1BoatSLRHtKNngkdXEeobR76b53LETtpyT": 1000.0,
-        }
+    __slots__ = ()
+    NAME = 'Cryptocurrency'  # Name used in transaction logs
+    _DISCOUNT = PercentageDiscount(20)  # 20% discount for Cryptocurrency
+    mock_wallets = _BALANCES["crypto"]
 
-    def validate(self, payment_details: dict) -> bool:
+    def validate(self, payment_details: dict) -> ValidationResult:
         wallet_address = payment_details.get("wallet_address")
 
-        if not wallet_address or len(wallet_address) != 34:
-            print("Invalid Cryptocurrency wallet address")
-            return False
-
+        # Only known wallets are accepted, so a single lookup also rejects empty or wrong-length addresses.
         if wallet_address not in self.mock_wallets:
-            print("Wallet address not found")
-            return False
+            return ValidationResult(False, "Wallet address not found")
 
-        print("Cryptocurrency wallet details are valid.")
-        return True
+        _logger.debug("Cryptocurrency wallet details are valid.")
+        return ValidationResult(True)
 
     def check_balance(self, payment_details: dict, amount: float) -> bool:
         wallet_address = payment_details.get("wallet_address")
@@ -172,21 +222,24 @@ class CryptocurrencyPayment(PaymentMethod):
         wallet_address = payment_details.get("wallet_address")
 
         if not self.check_balance(payment_details, amount):
-            print(f"Not enough money for {wallet_address}")
+            _logger.debug("Not enough money for %s", wallet_address)
             return False
 
         self.mock_wallets[wallet_address] -= amount
-        print(f"Processing Cryptocurrency payment of ${amount:.2f}...")
-        print(f"Cryptocurrency payment of ${amount:.2f} was successful.")
+        _logger.debug("Processing Cryptocurrency payment of $%.2f...", amount)
+        _logger.debug("Cryptocurrency payment of $%.2f was successful.", amount)
         return True
 
     def get_discount(self) -> Discount:
-        return PercentageDiscount(20)  # 20% discount for Cryptocurrency
+        return self._DISCOUNT
 
 # Order class with optional discount strategy
 # The Order class encapsulates the order details and applies the payment and discount strategies.
 # Follows the Single Responsibility Principle (SRP) as it manages only the order's state and its related operations & Liskov Substitution Principle.
+# Orders, discounts and payment methods declare __slots__ since their attributes are fixed.
 class Order:
+    __slots__ = ('items', 'quantities', 'prices', 'status', 'payment_method', 'discount_strategy', '_total')
+
     def __init__(self):
         self.items = []
         self.quantities = []
@@ -194,17 +247,17 @@ class Order:
         self.status = "open"
         self.payment_method = None
         self.discount_strategy = None
+        self._total = 0
 
     def add_item(self, name: str, quantity: int, price: float):
         self.items.append(name)
         self.quantities.append(quantity)
         self.prices.append(price)
+        self._total += quantity * price
 
+    # The running total is kept up to date by add_item, so this is O(1).
     def total_price(self):
-        total = 0
-        for quantity, price in zip(self.quantities, self.prices):
-            total += quantity * price
-        return total
+        return self._total
 
     def set_payment_method(self, payment_method: PaymentMethod):
         self.payment_method = payment_method
@@ -212,24 +265,30 @@ class Order:
     def set_discount_strategy(self, discount_strategy: Discount):
         self.discount_strategy = discount_strategy
 
-    def apply_discounts(self):
+    def apply_discounts(self, total: float = None):
+        if total is None:
+            total = self.total_price()
         if self.discount_strategy:
-            return self.discount_strategy.calculate_discount(self.total_price())
+            return self.discount_strategy.calculate_discount(total)
         return 0
 
-    def pay(self, payment_details: dict):
+    def pay(self, payment_details: dict) -> ValidationResult:
         if not self.payment_method:
-           return True
-        if self.payment_method.validate(payment_details):
-            discount = self.apply_discounts()
-            final_amount = self.total_price() - discount
-            if final_amount < 0:
-                final_amount = 0
-
-            if self.payment_method.process_payment(final_amount, payment_details):
-                self.status = "paid"
-                return True
-        return False
+           return ValidationResult(True)
+        result = self.payment_method.validate(payment_details)
+        if not result.ok:
+            return result
+
+        total = self.total_price()
+        discount = self.apply_discounts(total)
+        final_amount = total - discount
+        if final_amount < 0:
+            final_amount = 0
+
+        if self.payment_method.process_payment(final_amount, payment_details):
+            self.status = "paid"
+            return result
+        return ValidationResult(False, "Not enough money")
 
 # Abstract base class for logging transactions
 # Defines the interface for logging mechanisms.
@@ -239,17 +298,60 @@ class TransactionLogger(ABC):
     def log_transaction(self, payment_method: str, amount: float, success: bool):
         pass
 
+# Queue handlers shared by every FileLogger writing to the same file
+_handler_cache: dict[str, logging.Handler] = {}
+
+# Starts a background listener that owns the FileHandler and returns the QueueHandler feeding it.
+# The listener is stopped at exit so queued records are flushed to disk.
+def _make_queue_handler(filename: str) -> logging.Handler:
+    file_handler = logging.FileHandler(filename)
+    # The timestamp comes from the record's creation time and is formatted on the listener thread.
+    file_handler.setFormatter(logging.Formatter('%(asctime)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+    queue = Queue(-1)
+    listener = QueueListener(queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return QueueHandler(queue)
+
 # Concrete class for logging transactions to a file
 # Implements the file-based logging mechanism.
+# Each log file gets its own named logger and a single cached handler, so creating a FileLogger per transaction does not reconfigure the root logger.
+# Records are handed to a queue and written by a background thread, so logging never blocks the payment on disk I/O.
 class FileLogger(TransactionLogger):
     def __init__(self, filename: str):
         self.filename = filename
-        logging.basicConfig(filename=self.filename, level=logging.INFO, format='%(message)s')
+        self.logger = logging.getLogger(f"tx.{filename}")
+        if filename not in _handler_cache:
+            handler = _make_queue_handler(filename)
+            _handler_cache[filename] = handler
+            self.logger.addHandler(handler)
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
 
     def log_transaction(self, payment_method: str, amount: float, success: bool):
         status = 'Success' if success else 'Failure'
-        log_message = f"{datetime.now()}: {payment_method} payment of ${amount:.2f} - {status}"
-        logging.info(log_message)
+        # Arguments are passed through so logging only formats the message if the record is emitted.
+        self.logger.info("%s payment of $%.2f - %s", payment_method, amount, status)
+
+# Payment method registry
+# Maps each menu choice to its payment class (None for cash) and the (detail key, prompt) pairs it needs.
+PAYMENT_METHODS = {
+    '1': (CreditCardPayment, [
+        ("card_number", "Enter your Credit Card number (16 digits): "),
+        ("expiry_date", "Enter the expiry date (MM/YY): "),
+        ("cvv", "Enter the CVV (3 digits): "),
+    ]),
+    '2': (PayPalPayment, [
+        ("email", "Enter your PayPal email: "),
+    ]),
+    '3': (CryptocurrencyPayment, [
+        ("wallet_address", "Enter your Cryptocurrency wallet address: "),
+    ]),
+    '4': (None, [
+        ("name", "Enter your name: "),
+        ("address", "Enter your address: "),
+    ]),
+}
 
 # Main function
 # Demonstrates the use of Strategy Pattern and Dependency Injection by allowing different payment methods and discount strategies to be chosen at runtime.
@@ -276,17 +378,11 @@ def main():
     print("4. Cash")
     method_choice = input("Enter the number of your choice: ")
 
-    if method_choice == '1':
-        payment_method = CreditCardPayment()
-    elif method_choice == '2':
-        payment_method = PayPalPayment()
-    elif method_choice == '3':
-        payment_method = CryptocurrencyPayment()
-    elif method_choice == '4':
-        payment_method = None
-    else:
+    if method_choice not in PAYMENT_METHODS:
         print("Invalid choice.")
         return
+    payment_class, prompts = PAYMENT_METHODS[method_choice]
+    payment_method = payment_class() if payment_class else None
 
     # Set the payment method
     if payment_method:
@@ -296,39 +392,20 @@ def main():
             order.set_discount_strategy(discount_strategy)
 
     # Process the payment
-    payment_details = {}
+    payment_details = {key: input(prompt) for key, prompt in prompts}
     if payment_method:
-        if isinstance(payment_method, CreditCardPayment):
-            payment_details = {
-                "card_number": input("Enter your Credit Card number (16 digits): "),
-                "expiry_date": input("Enter the expiry date (MM/YY): "),
-                "cvv": input("Enter the CVV (3 digits): ")
-            }
-        elif isinstance(payment_method, PayPalPayment):
-            payment_details = {
-                "email": input("Enter your PayPal email: ")
-            }
-        elif isinstance(payment_method, CryptocurrencyPayment):
-            payment_details = {
-                "wallet_address": input("Enter your Cryptocurrency wallet address: ")
-            }
-
-        success = order.pay(payment_details)
+        result = order.pay(payment_details)
         logger = FileLogger('transactions.log')
-        payment_method_name = payment_method.__class__.__name__.replace('Payment', '')
-        logger.log_transaction(payment_method_name, order.total_price(), success)
-        if success:
+        logger.log_transaction(payment_method.NAME, order.total_price(), result.ok)
+        if result.ok:
             print("Payment successful!")
         else:
+            print(result.reason)
             print("Payment failed.")
     else:
-        payment_details = {
-                "name": input("Enter your name: "),
-                "address": input("Enter your address: ")
-            }      
         print("Cash payment does not include any discount.")
-        success = order.pay(payment_details)
-        logger = TransactionLogger('transactions.log')
+        success = order.pay(payment_details).ok
+        logger = FileLogger('transactions.log')
         logger.log_transaction("cash", order.total_price(), success) 
         print("Payment successful!")     
          